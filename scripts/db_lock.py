@@ -4,8 +4,10 @@ Simple file-based locking for SQLite databases.
 Prevents simultaneous writes to a shared database (e.g. SharePoint).
 """
 
+import os
 from pathlib import Path
 from datetime import datetime, timezone
+from functools import lru_cache
 import getpass                              # Get user ID
 import socket                               # Get machine ID
 
@@ -18,45 +20,56 @@ class DatabaseLockedError(RuntimeError):
 def _default_lock_path(db_path: Path) -> Path:   
     return db_path.with_suffix(".lock")
 
-### Public Function: Checks if .lock file exists
-# Raises DatabaseLockedError if file exists
-# If not: creates it and returns file Path
+### Internal Function: "user@host" string for lock files
+# (fixed for the life of the process, so looked up once and cached)
+@lru_cache(maxsize=None)
+def _lock_owner() -> str:
+    return f"{getpass.getuser()}@{socket.gethostname()}"
+
+### Public Function: Atomically creates the .lock file
+# Raises DatabaseLockedError if file already exists
+# If not: writes lock info and returns file Path
 def acquire_lock(
     db_path: str | Path,                    # Path to the SQLite database file 
     lock_path: str | Path | None = None,    # Optional explicit lock file path
     purpose: str | None = None,             # Optional short description of ingest
 ) -> Path:
 
-    db_path = Path(db_path)
+    db_path = db_path if isinstance(db_path, Path) else Path(db_path)
     lock_file = Path(lock_path) if lock_path else _default_lock_path(db_path)
 
-    # DB locked error message
-    if lock_file.exists():
-        message = lock_file.read_text(errors="ignore")
-        raise DatabaseLockedError(
-            f"Database is already locked.\n\n"
-            f"Lock file: {lock_file}\n\n"
-            f"{message}"
-        )
-
     # Gather metadata for collaboration and debugging
     timestamp = datetime.now(timezone.utc).isoformat()
-    user = getpass.getuser()
-    host = socket.gethostname()
 
     # Builds lock file (plain text for human user)
     contents = [
         "DATABASE LOCK",
         f"Database: {db_path}",
-        f"Locked by: {user}@{host}",
+        f"Locked by: {_lock_owner()}",
         f"Time (UTC): {timestamp}",
     ]
     # Option of including ingest purpose (future proofing)
     if purpose:
         contents.append(f"Purpose: {purpose}")
 
+    # Create the file only if it does not exist (O_EXCL makes check + create atomic,
+    # so two processes can never both acquire the lock)
+    try:
+        fd = os.open(str(lock_file), os.O_CREAT | os.O_EXCL | os.O_WRONLY, 0o644)
+    except FileExistsError:
+        # DB locked error message
+        message = lock_file.read_text(errors="ignore")
+        raise DatabaseLockedError(
+            f"Database is already locked.\n\n"
+            f"Lock file: {lock_file}\n\n"
+            f"{message}"
+        ) from None
+
     # write to disk
-    lock_file.write_text("\n".join(contents) + "\n")
+    try:
+        os.write(fd, ("\n".join(contents) + "\n").encode())
+    finally:
+        os.close(fd)
 
     # Store Path and metadata for use outside of function
     return lock_file
@@ -1,30 +1,25 @@
 from __future__ import annotations
 
 import argparse  # command-line argument parsing
+import importlib  # imports the selected ingester module on demand
 from pathlib import Path  # safe file path handling on Windows
 
 # Uses db_lock.py for file locking (prevent simultaneous write)
 from scripts.db_lock import acquire_lock, release_lock, DatabaseLockedError
 
-# Import source_type ingester modules (add more later)
 from scripts.path_config import load_local_paths_config, resolve_paths
-from scripts.inventory import ingest_vocab
-from scripts.inventory import ingest_survey_export
-from scripts.inventory import ingest_assumed_items
-from scripts.fire import ingest_input_single_event
-from scripts.fire import ingest_input_bulk_fris_events
-from scripts.fire import ingest_fire_event_mappings
-from scripts.fire import ingest_emission_parameters
-
 
+# Source_type ingester modules (add more later)
+# Stored as module paths and imported only once --type is known,
+# so a run does not pay the import cost (pandas etc.) of every ingester.
 INGESTERS = {
-    "survey": ingest_survey_export,
-    "vocab": ingest_vocab,
-    "assumed": ingest_assumed_items,
-    "single": ingest_input_single_event,
-    "fris": ingest_input_bulk_fris_events,
-    "fire_mappings": ingest_fire_event_mappings,
-    "emissions": ingest_emission_parameters,
+    "survey": "scripts.inventory.ingest_survey_export",
+    "vocab": "scripts.inventory.ingest_vocab",
+    "assumed": "scripts.inventory.ingest_assumed_items",
+    "single": "scripts.fire.ingest_input_single_event",
+    "fris": "scripts.fire.ingest_input_bulk_fris_events",
+    "fire_mappings": "scripts.fire.ingest_fire_event_mappings",
+    "emissions": "scripts.fire.ingest_emission_parameters",
 }
 
 
@@ -74,10 +69,16 @@ def main(argv: list[str] | None = None) -> int:
         help="Apply pruning actions (used with --prune and/or ingestion).",
     )
 
+    parser.add_argument(
+        "--quiet-plan",
+        action="store_true",
+        help="Skip the already-ingested count in the plan summary (avoids counting DB rows).",
+    )
+
     # Build ingest routine
     args = parser.parse_args(argv)
 
-    ingester = INGESTERS[args.type]
+    ingester = importlib.import_module(INGESTERS[args.type])
 
     # Load config + resolve paths (from local_paths.yaml)
     config = load_local_paths_config(Path("config") / "local_paths.yaml")
@@ -109,14 +110,17 @@ def main(argv: list[str] | None = None) -> int:
     # Compares raw files to DB to decide which are new (not already in DB)
     # ingester.plan returns a dict-like plan with keys:
     #   - new: list[Path]
-    #   - already_ingested: int
+    #   - already_ingested: int (or an int-like value resolved when printed)
     plan = ingester.plan(resolved.db_path, resolved.raw_dir, input_files)
 
     new_files = plan.get("new", [])     # Build list of new files
     already = plan.get("already_ingested", None)    # Produce count of already ingested
 
     if already is not None:
-        print(f"\nAlready ingested sources ({args.type}): {already}")
+        print()
+        # Printing the count is what triggers it for lazily counted plans
+        if not args.quiet_plan:
+            print(f"Already ingested sources ({args.type}): {already}")
         print(f"New files to ingest ({args.type}): {len(new_files)}")
 
     # Prints first 20 files for ingest
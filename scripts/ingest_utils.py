@@ -5,7 +5,7 @@ Miscelaneous helper utilities for common data ingestion tasks
 
 Provides:
 - content-based hashing of raw source files for unique primary key generation
-- database connection helpers
+- database connection helpers (incl. a shared per-process connection)
 - retrieval of existing source_ids by data_source_type
 - schema-tolerant logging of ingests (to ingest_log)
 - deletion of all database records associated with a source_id
@@ -15,46 +15,148 @@ This module is not tied to any specific source_type as is used by all ingest_<ty
 
 from __future__ import annotations
 
+import atexit
 import hashlib   # provides SHA-265 hash used to create source_id
 import sqlite3 
+from contextlib import contextmanager
 from dataclasses import dataclass  # create simple data containers
 from datetime import datetime, timezone
+from functools import lru_cache
+from operator import itemgetter
 from pathlib import Path
-from typing import Any, Iterable  # typing helpers
+from typing import Any, Callable, Iterable, Iterator  # typing helpers
 
 # --------------------------------------------------
 # Create UTC time 
 def utc_now_iso() -> str:
-    """Returns current date/time as ISO-8601 string in UTC."""
-    return datetime.now(timezone.utc).replace(microsecond=0).isoformat().replace("+00:00", "Z")
+    """Returns current date/time as ISO-8601 string in UTC (e.g. 2024-01-31T12:00:00Z)."""
+    return datetime.now(timezone.utc).strftime("%Y-%m-%dT%H:%M:%SZ")
 
 # --------------------------------------------------
 # DB connection helper
-def db_connect(db_path: Path) -> sqlite3.Connection:
+# WAL gives one fsync per commit and lets readers run alongside a writer;
+# synchronous=NORMAL is durable across application crashes in WAL mode.
+# busy_timeout comes first so the WAL switch (which needs a lock) also waits.
+_CONNECTION_PRAGMAS = (
+    "PRAGMA busy_timeout = 5000;",      # wait up to 5 s for a competing writer
+    "PRAGMA journal_mode = WAL;",
+    "PRAGMA synchronous = NORMAL;",
+    "PRAGMA cache_size = -64000;",      # ~64 MB page cache (negative = KiB)
+    "PRAGMA temp_store = MEMORY;",
+    "PRAGMA mmap_size = 268435456;",    # 256 MB memory-mapped reads
+)
+
+
+class _IngestConnection(sqlite3.Connection):
+    """
+    sqlite3.Connection that can carry small per-connection caches.
+    (The base C type does not allow setting attributes.)
+    """
+
+    def __init__(self, *args: Any, **kwargs: Any) -> None:
+        super().__init__(*args, **kwargs)
+        self._col_cache: dict[str, frozenset[str]] = {}
+
+
+def apply_connection_pragmas(con: sqlite3.Connection) -> None:
+    """
+    Apply the standard connection tuning (WAL, relaxed fsync, larger page
+    cache, in-memory temp store, mmap, busy timeout).
+    journal_mode persists in the DB file; the other PRAGMAs are
+    per-connection so must be set on every open.
+    """
+    for pragma in _CONNECTION_PRAGMAS:
+        con.execute(pragma)
+
+
+def db_connect(
+    db_path: Path,
+    *,
+    isolation_level: str | None = "",
+    cached_statements: int = 128,
+) -> sqlite3.Connection:
     """
     Open a SQLite connection to a chosen database
+
+    Applies connection tuning (see apply_connection_pragmas) before
+    enabling foreign keys. isolation_level and cached_statements are passed
+    through to sqlite3.connect (defaults match sqlite3's own); use
+    isolation_level=None when the caller issues its own BEGIN/COMMIT.
     """
-    con = sqlite3.connect(str(db_path))
+    con = sqlite3.connect(
+        str(db_path),
+        factory=_IngestConnection,
+        isolation_level=isolation_level,
+        cached_statements=cached_statements,
+    )
+    apply_connection_pragmas(con)
     con.execute("PRAGMA foreign_keys = ON;")  # Foreign keys are disabled by default in SQLite
     return con
 
+# --------------------------------------------------
+# Write transaction helper
+# Note: internal function (hence leading underscore)
+@contextmanager
+def _write_transaction(con: sqlite3.Connection) -> Iterator[sqlite3.Connection]:
+    """
+    Run a block of writes in one explicit BEGIN IMMEDIATE ... COMMIT.
+
+    BEGIN IMMEDIATE takes the write lock up front, so the batch cannot fail
+    part-way through on lock contention; any error rolls the batch back.
+    If the caller already has a transaction open, the block simply joins it
+    (the caller stays responsible for commit/rollback).
+    """
+    if con.in_transaction:
+        yield con
+        return
+
+    con.execute("BEGIN IMMEDIATE")
+    try:
+        yield con
+        con.execute("COMMIT")
+    except BaseException:
+        # SQLite may already have rolled back (e.g. disk full); a bare ROLLBACK
+        # would then raise "no transaction is active" and hide the real error
+        if con.in_transaction:
+            con.execute("ROLLBACK")
+        raise
+
+# --------------------------------------------------
+# Shared connection helper
+@lru_cache(maxsize=4)
+def get_conn(db_path: str) -> sqlite3.Connection:
+    """
+    Return a process-wide shared connection for a database path.
+
+    Lets several stages of one CLI run (e.g. plan and ingest_apply) reuse one
+    open connection and its warm page cache. Callers must NOT close it;
+    it is closed automatically at interpreter exit.
+    (Keyed on the path string, so pass str(db_path) consistently.)
+    """
+    con = db_connect(Path(db_path))
+    atexit.register(con.close)
+    return con
+
 # --------------------------------------------------
 # Create a unique hash (source_id) for primary key
-def compute_source_id(file_path: Path, chunk_size: int = 1024 * 1024) -> str:
+def compute_source_id(file_path: Path, chunk_size: int = 4 * 1024 * 1024) -> str:
     """
     Compute SHA-256 hash (64 char hex string) of file contents.
-    (Chunks first to avoid loading the entire file into memory.)
+    (Streams the file to avoid loading it entirely into memory.)
 
     This is used as a stable, content-addressed source_id:
     Stored as sources.source_id
     Note: identical file contents -> identical source_id
     (so any file change -> new source_id)
     """
-    file_path = Path(file_path)
-    h = hashlib.sha256()
-    with file_path.open("rb") as f:  # rb = binary read mode
+    with open(file_path, "rb", buffering=0) as f:  # rb = binary read mode (unbuffered)
+        # Python 3.11+: hashing loop runs in C and releases the GIL
+        if hasattr(hashlib, "file_digest"):
+            return hashlib.file_digest(f, "sha256").hexdigest()
+
+        h = hashlib.sha256()
         while True:
-            chunk = f.read(chunk_size)   # reads up to 1MB
+            chunk = f.read(chunk_size)   # reads up to 4MB
             if not chunk:
                 break
             h.update(chunk)   # feeds the chunk into the hash
@@ -79,11 +181,45 @@ def fetch_existing_source_ids(
 # Table inspection for robust logging
 # (ingest_log may change so detects what actually exists, rather than what it expects)
 # Note: internal function (hence leading underscore)
-def _table_columns(con: sqlite3.Connection, table_name: str) -> set[str]:
-    """Returns a set of column names for ingest_log (or empty set if table is missing)."""
+def _table_columns(con: sqlite3.Connection, table_name: str) -> frozenset[str]:
+    """
+    Returns a set of column names for ingest_log (or empty set if table is missing).
+
+    Results are cached on connections opened by db_connect(), so the PRAGMA
+    runs once per (connection, table) rather than on every insert.
+    """
+    cache = getattr(con, "_col_cache", None)
+    if cache is not None and table_name in cache:
+        return cache[table_name]
+
     rows = con.execute(f"PRAGMA table_info({table_name})").fetchall()
     # PRAGMA table_info returns: cid, name, type, notnull, dflt_value, PK
-    return {r[1] for r in rows} if rows else set()   # r[1] is column name
+    cols = frozenset(r[1] for r in rows)   # r[1] is column name
+
+    # Only cache tables that exist (a missing table may be created later)
+    if cache is not None and cols:
+        cache[table_name] = cols
+    return cols
+
+# Insert statement builder
+# (the same few column combinations recur, so the SQL is built once per combination)
+@lru_cache(maxsize=32)
+def _prepare_insert(
+    table: str,
+    keys: tuple[str, ...],
+) -> tuple[str, Callable[[dict[str, Any]], tuple[Any, ...]]]:
+    """
+    Returns the INSERT statement for the given table and ordered column names,
+    plus a callable that pulls the matching values tuple out of a row dict.
+    """
+    placeholders = ", ".join(["?"] * len(keys)) # creates a string with right number of placeholders
+    sql = f"INSERT INTO {table} ({', '.join(keys)}) VALUES ({placeholders})"
+
+    # itemgetter builds the tuple in C (but returns a bare value for a single key)
+    if len(keys) == 1:
+        key = keys[0]
+        return sql, lambda row: (row[key],)
+    return sql, itemgetter(*keys)
 
 # Row insertion
 # Note: internal function (hence leading underscore)
@@ -99,8 +235,8 @@ def _insert_row(con: sqlite3.Connection, table: str, values: dict[str, Any]) ->
     if not cols:
         raise RuntimeError(f"Table '{table}' not found in database.")
 
-    filtered = {k: v for k, v in values.items() if k in cols and v is not None}
-    if not filtered:
+    keys = tuple(k for k, v in values.items() if v is not None and k in cols) # columns to insert
+    if not keys:
         # Nothing to insert (e.g. table exists but our provided fields don't match)
         raise RuntimeError(
             f"Table '{table}' exists but none of the provided fields match its columns.\n"
@@ -108,14 +244,10 @@ def _insert_row(con: sqlite3.Connection, table: str, values: dict[str, Any]) ->
             f"Table columns: {sorted(cols)}"
         )
 
-    # Builds the insert statement dynamically
-    keys = list(filtered.keys()) # list of columns to insert
-    placeholders = ", ".join(["?"] * len(keys)) # creates a string with right number of placeholders
-    sql = f"INSERT INTO {table} ({', '.join(keys)}) VALUES ({placeholders})"
-    
     # Executes with the values in matching order
-    # (converts to a tuple becayse SQLite's API expects a sequence)
-    con.execute(sql, tuple(filtered[k] for k in keys))
+    # (as a tuple because SQLite's API expects a sequence)
+    sql, getter = _prepare_insert(table, keys)
+    con.execute(sql, getter(values))
 
 # --------------------------------------------------
 # Record the ingest run in ingest_log
@@ -186,15 +318,31 @@ class DeleteSummary:
 
 
 
+# Child tables linked to sources by source_id (all declared ON DELETE CASCADE)
+_SOURCE_CHILD_TABLES = (
+    "inventory_observations",
+    "dwelling_observations",
+    "survey_comments",
+)
+
+
 def delete_by_source_id(con: sqlite3.Connection, source_id: str) -> DeleteSummary:
     """
-    Delete all child rows linked to source_id, then delete the sources row.
+    Delete the sources row for source_id; child rows go with it via ON DELETE CASCADE.
 
     Current child tables linked by source_id:
       - inventory_observations
       - dwelling_observations
       - survey_comments
 
+    Child row counts are read (in one query) before the delete so the summary
+    still reports rows removed per table. Requires foreign keys to be enabled
+    on the connection (db_connect() does this); raises RuntimeError otherwise,
+    rather than silently leaving orphaned child rows.
+
+    Runs in its own BEGIN IMMEDIATE transaction (committed on return) unless
+    the caller already has a transaction open, in which case it joins it.
+
     This function does NOT delete ingest_log rows, as the audit trail is useful.
 
     Returns
@@ -202,22 +350,29 @@ def delete_by_source_id(con: sqlite3.Connection, source_id: str) -> DeleteSummar
     DeleteSummary
         A structured summary showing how many rows were deleted from each table.
     """
-    cur = con.cursor()
+    if not con.execute("PRAGMA foreign_keys;").fetchone()[0]:
+        raise RuntimeError("delete_by_source_id requires PRAGMA foreign_keys = ON (use db_connect()).")
 
-    deleted_by_table: dict[str, int] = {}
+    cur = con.cursor()
+    params = (source_id,)
 
-    child_tables = [
-        "inventory_observations",
-        "dwelling_observations",
-        "survey_comments",
-    ]
+    # Count child rows for every table in one statement
+    count_sql = "SELECT " + ", ".join(
+        f"(SELECT COUNT(*) FROM {table} WHERE source_id = ?)" for table in _SOURCE_CHILD_TABLES
+    )
+    # Count + delete in one write transaction so the counts match what is removed
+    with _write_transaction(con):
+        counts = cur.execute(count_sql, params * len(_SOURCE_CHILD_TABLES)).fetchone()
 
-    for table in child_tables:
-        cur.execute(f"DELETE FROM {table} WHERE source_id = ?", (source_id,))
-        deleted_by_table[table] = cur.rowcount if cur.rowcount not in (None, -1) else 0
+        cur.execute("DELETE FROM sources WHERE source_id = ?", params)
+        n_sources = cur.rowcount if cur.rowcount not in (None, -1) else 0
 
-    cur.execute("DELETE FROM sources WHERE source_id = ?", (source_id,))
-    deleted_by_table["sources"] = cur.rowcount if cur.rowcount not in (None, -1) else 0
+    # Children are only removed if the parent row existed
+    deleted_by_table: dict[str, int] = {
+        table: int(n) if n_sources else 0
+        for table, n in zip(_SOURCE_CHILD_TABLES, counts)
+    }
+    deleted_by_table["sources"] = n_sources
 
     # Returns a structured object summarisong the outcome
     return DeleteSummary(
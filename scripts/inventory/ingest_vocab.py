@@ -1,10 +1,10 @@
 # scripts/ingest_vocab.py
 from __future__ import annotations
 
-import sqlite3
 from pathlib import Path
 from typing import Any
 
+from scripts.ingest_utils import get_conn
 from scripts.inventory import vocab
 
 # Enforce ingestion from only this file (must exist).
@@ -21,8 +21,7 @@ def scan_inputs(raw_dir: Path) -> list[Path]:
     Raises:
         FileNotFoundError if mapping_list.xlsx is missing.
     """
-    raw_dir = Path(raw_dir)
-    xlsx_path = raw_dir / EXPECTED_FILENAME
+    xlsx_path = Path(raw_dir, EXPECTED_FILENAME)
     if not xlsx_path.exists():
         raise FileNotFoundError(
             f"Vocab mapping list not found: {xlsx_path}\n"
@@ -31,36 +30,63 @@ def scan_inputs(raw_dir: Path) -> list[Path]:
     return [xlsx_path]
 
 
+# Row counts for each vocab table, returned as one row
+_COUNT_ROWS_SQL = """
+    SELECT
+        (SELECT COUNT(*) FROM item_dictionary),
+        (SELECT COUNT(*) FROM furniture),
+        (SELECT COUNT(*) FROM room),
+        (SELECT COUNT(*) FROM dwelling_size);
+"""
+
+
 def _count_rows(db_path: Path) -> dict[str, int]:
     """
     Counts rows in vocab tables.
     Assumes tables exist in the schema; raises sqlite errors if not.
+    Uses the shared connection from ingest_utils (so is not closed here).
     """
-    db_path = Path(db_path)
-    con = sqlite3.connect(str(db_path))   # opens SQLite connection to DB
-    try:
-        con.execute("PRAGMA foreign_keys = ON;")  # Enables foreign key enforcement
-        cur = con.cursor() # Creates a cursor to execute queries
-
-        # Private function to count rows in any table
-        def _count(table: str) -> int:
-            row = cur.execute(f"SELECT COUNT(*) FROM {table};").fetchone()
-            return int(row[0]) if row and row[0] is not None else 0
-
-        n_items = _count("item_dictionary")
-        n_classes = _count("furniture")
-        n_rooms = _count("room")
-        n_dwelling_size = _count("dwelling_size")
-
-        return {
-            "rows_item_dictionary": n_items,
-            "rows_furniture_class": n_classes,
-            "rows_room_type": n_rooms,
-            "rows_dwelling_size": n_dwelling_size,
-            "rows_total": n_items + n_classes + n_rooms + n_dwelling_size,
-        }
-    finally:
-        con.close()
+    con = get_conn(str(db_path))   # shared SQLite connection to DB
+
+    # Counts all vocab tables in a single statement (one round trip)
+    n_items, n_classes, n_rooms, n_dwelling_size = (
+        int(n or 0) for n in con.execute(_COUNT_ROWS_SQL).fetchone()
+    )
+
+    return {
+        "rows_item_dictionary": n_items,
+        "rows_furniture_class": n_classes,
+        "rows_room_type": n_rooms,
+        "rows_dwelling_size": n_dwelling_size,
+        "rows_total": n_items + n_classes + n_rooms + n_dwelling_size,
+    }
+
+# Private class: row count that is only queried when actually used
+class _LazyCount:
+    """
+    Stands in for the 'already_ingested' int in plan().
+    Runs _count_rows() on first int()/str()/format() and reuses the result,
+    so dispatcher runs that never display the count skip the query.
+    """
+
+    def __init__(self, db_path: Path) -> None:
+        self._db_path = db_path
+        self._value: int | None = None
+
+    def __int__(self) -> int:
+        if self._value is None:
+            self._value = int(_count_rows(self._db_path).get("rows_total", 0))
+        return self._value
+
+    __index__ = __int__
+
+    def __str__(self) -> str:
+        return str(int(self))
+
+    __repr__ = __str__
+
+    def __format__(self, format_spec: str) -> str:
+        return format(int(self), format_spec)
 
 # Private function: Ensures the file exists before planning or ingesting.
 def _validate_single_mapping_list(files: list[Path]) -> Path:
@@ -73,7 +99,7 @@ def _validate_single_mapping_list(files: list[Path]) -> Path:
             f"Got {len(files)} file(s): {[str(p) for p in files]}"
         )
 
-    p = Path(files[0])
+    p = files[0] if isinstance(files[0], Path) else Path(files[0])
 
     # Reject non-xlsx.
     if p.suffix.lower() != ".xlsx":   
@@ -98,20 +124,18 @@ def plan(db_path: Path, raw_dir: Path, input_files: list[Path]) -> dict[str, Any
 
     Current policy:
       - treat the mapping_list.xlsx file as 'new' whenever it exists.
-      - 'already_ingested' is the current total row count across vocab tables.
+      - 'already_ingested' is the current total row count across vocab tables
+        (evaluated lazily; see _LazyCount).
     """
-    _ = Path(raw_dir)  # kept for consistency with other ingesters (not used here)
+    _ = raw_dir  # kept for consistency with other ingesters (not used here)
     xlsx_path = _validate_single_mapping_list(input_files)
 
-    # Count current vocab table rows (what already exists)
-    counts = _count_rows(Path(db_path))
-    already = int(counts.get("rows_total", 0))
-
     # Returns plan dict in the form expected by ingest.py:
-    # a list of paths + count value of already ingested rows (int of None)
+    # a list of paths + count value of already ingested rows
+    # (counted lazily, only if the dispatcher displays it)
     return {
         "new": [xlsx_path], 
-        "already_ingested": already,
+        "already_ingested": _LazyCount(db_path),
     }
 
 
@@ -143,20 +167,22 @@ def ingest_apply(db_path: Path, raw_dir: Path, new_files: list[Path]) -> dict[st
     Apply vocab ingestion using vocab.ingest_mapping_list_pandas().
 
     Default mode: replace_all (overwrite existing + add new).
+    Reads the workbook with the calamine backend where available.
     """
-    _ = Path(raw_dir)  # kept for signature consistency; not used currently
+    _ = raw_dir  # kept for signature consistency; not used currently
+    db_path = db_path if isinstance(db_path, Path) else Path(db_path)
     xlsx_path = _validate_single_mapping_list(new_files)
 
     # Apply ingest (DB write). 
     # Function called from vocab.py.
     vocab.ingest_mapping_list_pandas(
-        db_path=Path(db_path),
+        db_path=db_path,
         xlsx_path=xlsx_path,
         mode="replace_all",
     )
 
     # Post-ingest counts (nice-to-have)
-    counts = _count_rows(Path(db_path))
+    counts = _count_rows(db_path)
 
     return {
         "file": str(xlsx_path),
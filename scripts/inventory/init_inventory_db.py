@@ -10,6 +10,7 @@ import argparse
 import sqlite3
 from pathlib import Path
 
+from scripts.ingest_utils import apply_connection_pragmas, db_connect
 from scripts.path_config import load_local_paths_config
 
 # FUNCTION: Create the intended DB filepath
@@ -51,505 +52,480 @@ def resolve_db_path(profile: str, db_handle: str, config: dict) -> Path:
     return sharepoint_root / Path(root) / Path(rel_db)
 
 
+# Schema version stamped into PRAGMA user_version once the DDL below has run.
+# Bump this whenever a table/index definition in init_database changes.
+SCHEMA_VERSION = 1
+
+# All tables and indexes, applied in a single executescript call and one
+# transaction. The final PRAGMA stamps the schema version (see SCHEMA_VERSION).
+_SCHEMA_DDL = f"""
+BEGIN;
+
+-- -----------------------------------------
+-- SOURCES
+-- Build sources data table headings & type
+-- -----------------------------------------
+CREATE TABLE IF NOT EXISTS sources (
+    source_id TEXT PRIMARY KEY,
+    data_source_type TEXT NOT NULL,
+    source_description TEXT,
+    source_org TEXT,
+    file_name TEXT,
+    file_path TEXT,
+    url TEXT,
+    date_collected TEXT,
+    date_imported_utc TEXT NOT NULL,
+    notes TEXT
+);
+
+-- Speed up queries based on data_source_type
+    CREATE INDEX IF NOT EXISTS idx_sources_data_source_type
+    ON sources (data_source_type);
+
+-- ----------------------------------------------
+-- INVENTORY OBSERVATIONS
+-- Build inventory data table headings & type
+-- Note: Can delete references based on source_id
+-- ----------------------------------------------
+CREATE TABLE IF NOT EXISTS inventory_observations (
+    obs_id INTEGER PRIMARY KEY,
+    response_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    room_type TEXT,
+    item_name TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE,
+    FOREIGN KEY (room_type) REFERENCES room(room_type),
+    FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name)
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_inv_source
+    ON inventory_observations (source_id);
+    CREATE INDEX IF NOT EXISTS idx_inv_response_id
+    ON inventory_observations (response_id);
+    CREATE INDEX IF NOT EXISTS idx_inv_room
+    ON inventory_observations (room_type);
+    CREATE INDEX IF NOT EXISTS idx_inv_item_name
+    ON inventory_observations (item_name);
+
+-- -------------------------------------------------
+-- DWELLING OBSERVATIONS
+-- Build dwelling data table headings & type
+-- Note: Can delete references based on source_id
+-- -------------------------------------------------
+CREATE TABLE IF NOT EXISTS dwelling_observations (
+    dwelling_id INTEGER PRIMARY KEY,
+    response_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    room_type TEXT NOT NULL,
+    count INTEGER NOT NULL,
+    assumption_notes TEXT,
+    FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE,
+    FOREIGN KEY (room_type) REFERENCES room(room_type)
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_dwell_source
+    ON dwelling_observations (source_id);
+    CREATE INDEX IF NOT EXISTS idx_dwell_response_id
+    ON dwelling_observations (response_id);
+    CREATE INDEX IF NOT EXISTS idx_dwell_room
+    ON dwelling_observations (room_type);
+
+-- -------------------------------------
+-- SURVEY COMMENTS
+-- Build survey comments table headings & type
+-- Note: Can delete references based on source_id
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS survey_comments (
+    comment_obs_id INTEGER PRIMARY KEY,
+    response_id TEXT NOT NULL,
+    source_id TEXT NOT NULL,
+    comment_type TEXT NOT NULL,
+    comment_text TEXT NOT NULL,
+    FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_comments_source
+    ON survey_comments (source_id);
+    CREATE INDEX IF NOT EXISTS idx_comments_response_id
+    ON survey_comments (response_id);
+    CREATE INDEX IF NOT EXISTS idx_comments_type
+    ON survey_comments (comment_type);
+
+-- -------------------------------------
+-- ITEM DICTIONARY (curated vocab)
+-- Controlled vocabulary / mapping table
+-- Contains the canonical list of items
+-- From mapping_list.xlsx sheet: "item_name"
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS item_dictionary (
+    item_name TEXT PRIMARY KEY,
+    item_description TEXT NOT NULL UNIQUE,
+    item_mass REAL NOT NULL,
+    ons_price REAL,
+    price_search_term TEXT,
+    defra_spend_factor_CO2 REAL NOT NULL,
+    furniture_class TEXT NOT NULL,
+    notes TEXT,
+
+    FOREIGN KEY (furniture_class)
+        REFERENCES furniture(furniture_class)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT,
+
+    CHECK (item_mass > 0),
+    CHECK (ons_price IS NULL OR ons_price > 0),
+    CHECK (defra_spend_factor_CO2 > 0)
+);
+
+    CREATE INDEX IF NOT EXISTS idx_item_dict_furniture_class
+    ON item_dictionary (furniture_class);
+
+-- -------------------------------------
+-- FURNITURE (curated vocab)
+-- Stores category level data
+-- From mapping_list.xlsx sheet: "furniture_class"
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS furniture (
+    furniture_class TEXT PRIMARY KEY,
+    furniture_description TEXT,
+    class_contains TEXT,
+    kgC_kg REAL NOT NULL,
+    ratio_fossil REAL NOT NULL,
+    ratio_biog REAL NOT NULL,
+    notes TEXT,
+
+    CHECK (kgC_kg >= 0),
+    CHECK (ratio_fossil >= 0 AND ratio_fossil <= 1),
+    CHECK (ratio_biog >= 0 AND ratio_biog <= 1),
+    CHECK (ratio_fossil + ratio_biog BETWEEN 0.99 AND 1.01)
+);
+
+-- -------------------------------------
+-- ROOM (curated vocab)
+-- From mapping_list.xlsx sheet: "room_type"
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS room (
+    room_type TEXT PRIMARY KEY,
+    room_description TEXT NOT NULL UNIQUE,
+    room_size_m2 REAL NOT NULL,
+    size_assumed INTEGER,
+    room_type_comp_1 TEXT,
+    room_type_comp_2 TEXT,
+    room_type_comp_ratio REAL,
+    assumption_notes TEXT,
+    notes TEXT,
+    FOREIGN KEY (room_type_comp_1) REFERENCES room(room_type),
+    FOREIGN KEY (room_type_comp_2) REFERENCES room(room_type),
+    CHECK (
+        room_type_comp_ratio IS NULL
+        OR room_type_comp_ratio >= 0
+    )
+);
+
+
+-- -------------------------------------
+-- ASSUMED INVENTORY
+-- Build assumed inventory table headings & type
+-- -------------------------------------
+CREATE TABLE IF NOT EXISTS assumed_inventory (
+    assumed_item_id INTEGER PRIMARY KEY,
+    room_type TEXT NOT NULL,
+    item_name TEXT NOT NULL,
+    count_assumed INTEGER NOT NULL,
+    dependency TEXT,
+    dependency_type TEXT,
+    dependency_quantifier REAL,
+    assumption_notes TEXT,
+    FOREIGN KEY (room_type) REFERENCES room(room_type),
+    FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
+    UNIQUE (item_name, room_type),
+    CHECK (count_assumed >= 0),
+    CHECK (
+        dependency_type IS NULL
+        OR dependency_type IN ('item_name', 'room_type')
+    ),
+    CHECK (
+        dependency_quantifier IS NULL
+        OR dependency_quantifier >= 0
+    )
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_assumed_room
+    ON assumed_inventory (room_type);
+    CREATE INDEX IF NOT EXISTS idx_assumed_item_name
+    ON assumed_inventory (item_name);
+    CREATE INDEX IF NOT EXISTS idx_assumed_dependency
+    ON assumed_inventory (dependency_type, dependency);
+
+
+-- -----------------------
+-- INGEST LOG
+-- Simple audit trail
+-- -----------------------
+CREATE TABLE IF NOT EXISTS ingest_log (
+    ingest_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    source_id TEXT,
+    data_source_type TEXT,
+    action TEXT,
+    status TEXT,
+    message TEXT,
+    started_utc TEXT,
+    finished_utc TEXT,
+    rows_inserted INTEGER,
+    rows_deleted INTEGER,
+    FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE SET NULL
+);
+
+-- -----------------------
+-- ITEM COUNT DISTRIBUTION
+-- Count probability distribution
+-- -----------------------
+CREATE TABLE IF NOT EXISTS item_count_pmf (
+    item_pmf_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_name TEXT NOT NULL,
+    room_type TEXT NOT NULL,
+    count_value INTEGER NOT NULL,
+    item_frequency INTEGER,
+    item_probability REAL,
+    item_pmf_notes TEXT,
+    FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
+    FOREIGN KEY (room_type) REFERENCES room(room_type)
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_item_count_pmf_item_room
+    ON item_count_pmf (item_name, room_type);
+
+-- -----------------------
+-- ITEM COUNT SUMMARY
+-- Count probality summary
+-- -----------------------
+CREATE TABLE IF NOT EXISTS item_count_summary (
+    item_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_name TEXT NOT NULL,
+    room_type TEXT NOT NULL,
+    expected_count_mean REAL NOT NULL,
+    count_q25 REAL,
+    count_q75 REAL,
+    count_summary_notes TEXT,
+    FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
+    FOREIGN KEY (room_type) REFERENCES room(room_type),
+    CHECK (expected_count_mean >= 0.0),
+    CHECK (count_q25 IS NULL OR count_q25 >= 0.0),
+    CHECK (count_q75 IS NULL OR count_q75 >= 0.0),
+    UNIQUE (item_name, room_type)
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_item_count_summary_item_room
+    ON item_count_summary (item_name, room_type);
+
+
+-- -----------------------
+-- ROOM COUNT DISTRIBUTION
+-- Count probability distribution
+-- -----------------------
+CREATE TABLE IF NOT EXISTS room_count_pmf (
+    room_pmf_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_type TEXT NOT NULL,
+    count_value INTEGER NOT NULL,
+    room_frequency INTEGER,
+    room_probability REAL,
+    room_pmf_notes TEXT,
+    FOREIGN KEY (room_type) REFERENCES room(room_type)
+);
+
+
+-- -----------------------
+-- ROOM COUNT SUMMARY
+-- Count probality summary
+-- -----------------------
+CREATE TABLE IF NOT EXISTS room_count_summary (
+    room_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_type TEXT NOT NULL,
+    expected_count_mean REAL,
+    count_q25 REAL,
+    count_q75 REAL,
+    count_summary_notes TEXT,
+    FOREIGN KEY (room_type) REFERENCES room(room_type),
+    CHECK (expected_count_mean >= 0.0),
+    CHECK (count_q25 IS NULL OR count_q25 >= 0.0),
+    CHECK (count_q75 IS NULL OR count_q75 >= 0.0),
+    UNIQUE (room_type)
+);
+
+-- -----------------------
+-- CARBON STOCK SUMMARY
+-- Room level carbon mass
+-- -----------------------
+CREATE TABLE IF NOT EXISTS room_carbon_stock (
+    carbon_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_type TEXT NOT NULL UNIQUE,
+    expected_total_carbon_kgC REAL,
+    expected_biog_carbon_kgC REAL,
+    expected_fossil_carbon_kgC REAL,
+    q25_total_carbon_kgC REAL,
+    q25_biog_carbon_kgC REAL,
+    q25_fossil_carbon_kgC REAL,
+    q75_total_carbon_kgC REAL,
+    q75_biog_carbon_kgC REAL,
+    q75_fossil_carbon_kgC REAL,
+    carbon_notes TEXT,
+
+    FOREIGN KEY (room_type) REFERENCES room(room_type)
+);
+
+-- Speed up queries based on commonly used variables
+    CREATE INDEX IF NOT EXISTS idx_room_carbon_stock_room
+    ON room_carbon_stock (room_type);
+
+
+-- -----------------------
+-- EMBODIED CO2 SUMMARY
+-- Room level replacement embodied CO2 emissions
+-- -----------------------
+CREATE TABLE IF NOT EXISTS room_embodied_CO2 (
+    room_embodied_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    room_type TEXT NOT NULL UNIQUE,
+
+    expected_embodied_CO2_kg REAL,
+    q25_embodied_CO2_kg REAL,
+    q75_embodied_CO2_kg REAL,
+
+    embodied_CO2_notes TEXT,
+
+    FOREIGN KEY (room_type)
+        REFERENCES room(room_type)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT,
+
+    CHECK (expected_embodied_CO2_kg IS NULL OR expected_embodied_CO2_kg >= 0),
+    CHECK (q25_embodied_CO2_kg IS NULL OR q25_embodied_CO2_kg >= 0),
+    CHECK (q75_embodied_CO2_kg IS NULL OR q75_embodied_CO2_kg >= 0)
+);
+
+-- -----------------------
+-- DELLING SIZE
+-- Dwelling level data
+-- -----------------------
+CREATE TABLE IF NOT EXISTS dwelling_size (
+    dwelling_type TEXT PRIMARY KEY,
+    dwelling_size_m2 REAL,
+    count_value INTEGER,
+    dwelling_type_pmf REAL,
+    dwelling_notes TEXT
+);
+
+-- -----------------------
+-- EMBODIED CARBON DATA
+-- Spend-based embodied carbon data
+-- -----------------------
+CREATE TABLE IF NOT EXISTS embodied_carbon_data (
+    embodied_carbon_id INTEGER PRIMARY KEY AUTOINCREMENT,
+    item_name TEXT NOT NULL,
+    amazon_price_top_1 REAL,
+    amazon_price_top_2 REAL,
+    amazon_price_top_3 REAL,
+    amazon_price_top_4 REAL,
+    amazon_price_top_5 REAL,
+    amazon_price_top_6 REAL,
+    amazon_price_top_7 REAL,
+    amazon_price_top_8 REAL,
+    amazon_price_top_9 REAL,
+    amazon_price_top_10 REAL,
+    amazon_price_mean REAL,
+    amazon_price_std REAL,
+    amazon_price_upper REAL,
+    replacement_cost_adjusted REAL,
+    embodied_CO2_kg REAL,
+    notes TEXT,
+
+    FOREIGN KEY (item_name)
+        REFERENCES item_dictionary(item_name)
+        ON UPDATE CASCADE
+        ON DELETE RESTRICT,
+
+    UNIQUE (item_name),
+
+    CHECK (amazon_price_top_1 IS NULL OR amazon_price_top_1 > 0),
+    CHECK (amazon_price_top_2 IS NULL OR amazon_price_top_2 > 0),
+    CHECK (amazon_price_top_3 IS NULL OR amazon_price_top_3 > 0),
+    CHECK (amazon_price_top_4 IS NULL OR amazon_price_top_4 > 0),
+    CHECK (amazon_price_top_5 IS NULL OR amazon_price_top_5 > 0),
+    CHECK (amazon_price_top_6 IS NULL OR amazon_price_top_6 > 0),
+    CHECK (amazon_price_top_7 IS NULL OR amazon_price_top_7 > 0),
+    CHECK (amazon_price_top_8 IS NULL OR amazon_price_top_8 > 0),
+    CHECK (amazon_price_top_9 IS NULL OR amazon_price_top_9 > 0),
+    CHECK (amazon_price_top_10 IS NULL OR amazon_price_top_10 > 0),
+    CHECK (amazon_price_mean IS NULL OR amazon_price_mean > 0),
+    CHECK (amazon_price_std IS NULL OR amazon_price_std >= 0),
+    CHECK (amazon_price_upper IS NULL OR amazon_price_upper > 0),
+    CHECK (replacement_cost_adjusted IS NULL OR replacement_cost_adjusted > 0),
+    CHECK (embodied_CO2_kg IS NULL OR embodied_CO2_kg > 0)
+);
+
+PRAGMA user_version = {SCHEMA_VERSION};
+COMMIT;
+"""
+
+
 # FUNCTION: creates a blank SQLite database; taking a string as input and returning nothing
-def init_database(sqlite_path: str) -> None:
+# (pass an open connection as con to reuse it; it is then left open for the caller)
+def init_database(sqlite_path: str, con: sqlite3.Connection | None = None) -> None:
     db_path = Path(sqlite_path)                         # converts input string into sqlite path
     db_path.parent.mkdir(parents=True, exist_ok=True)   # creates subfolders if included in str
 
-    # Opens connection to database file OR creates it
-    con = sqlite3.connect(db_path)
+    # Opens connection to database file OR creates it (unless one was given)
+    owns_con = con is None
+    if owns_con:
+        con = sqlite3.connect(db_path)
     try:
         cur = con.cursor()
 
         # Enable defaults (PRAGMAs = SQLite settings)
         cur.execute("PRAGMA foreign_keys = ON;")
-        cur.execute("PRAGMA journal_mode = WAL;")
-
-        # -----------------------------------------
-        # SOURCES
-        # Build sources data table headings & type
-        # -----------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS sources (
-            source_id TEXT PRIMARY KEY,
-            data_source_type TEXT NOT NULL,
-            source_description TEXT,
-            source_org TEXT,
-            file_name TEXT,
-            file_path TEXT,
-            url TEXT,
-            date_collected TEXT,
-            date_imported_utc TEXT NOT NULL,
-            notes TEXT
-        );
-        """)
-
-        # Speed up queries based on data_source_type
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_sources_data_source_type
-            ON sources (data_source_type);
-        """)
-
-                # ----------------------------------------------
-        # INVENTORY OBSERVATIONS
-        # Build inventory data table headings & type
-        # Note: Can delete references based on source_id
-        # ----------------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS inventory_observations (
-            obs_id INTEGER PRIMARY KEY,
-            response_id TEXT NOT NULL,
-            source_id TEXT NOT NULL,
-            room_type TEXT,
-            item_name TEXT NOT NULL,
-            count INTEGER NOT NULL,
-            FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE,
-            FOREIGN KEY (room_type) REFERENCES room(room_type),
-            FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name)
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_inv_source
-            ON inventory_observations (source_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_inv_response_id
-            ON inventory_observations (response_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_inv_room
-            ON inventory_observations (room_type);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_inv_item_name
-            ON inventory_observations (item_name);
-        """)
-
-        # -------------------------------------------------
-        # DWELLING OBSERVATIONS
-        # Build dwelling data table headings & type
-        # Note: Can delete references based on source_id
-        # -------------------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS dwelling_observations (
-            dwelling_id INTEGER PRIMARY KEY,
-            response_id TEXT NOT NULL,
-            source_id TEXT NOT NULL,
-            room_type TEXT NOT NULL,
-            count INTEGER NOT NULL,
-            assumption_notes TEXT,
-            FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE,
-            FOREIGN KEY (room_type) REFERENCES room(room_type)
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_dwell_source
-            ON dwelling_observations (source_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_dwell_response_id
-            ON dwelling_observations (response_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_dwell_room
-            ON dwelling_observations (room_type);
-        """)
-
-        # -------------------------------------
-        # SURVEY COMMENTS
-        # Build survey comments table headings & type
-        # Note: Can delete references based on source_id
-        # -------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS survey_comments (
-            comment_obs_id INTEGER PRIMARY KEY,
-            response_id TEXT NOT NULL,
-            source_id TEXT NOT NULL,
-            comment_type TEXT NOT NULL,
-            comment_text TEXT NOT NULL,
-            FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE CASCADE
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_comments_source
-            ON survey_comments (source_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_comments_response_id
-            ON survey_comments (response_id);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_comments_type
-            ON survey_comments (comment_type);
-        """)
-
-# -------------------------------------
-        # ITEM DICTIONARY (curated vocab)
-        # Controlled vocabulary / mapping table
-        # Contains the canonical list of items
-        # From mapping_list.xlsx sheet: "item_name"
-        # -------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS item_dictionary (
-            item_name TEXT PRIMARY KEY,
-            item_description TEXT NOT NULL UNIQUE,
-            item_mass REAL NOT NULL,
-            ons_price REAL,
-            price_search_term TEXT,
-            defra_spend_factor_CO2 REAL NOT NULL,
-            furniture_class TEXT NOT NULL,
-            notes TEXT,
-
-            FOREIGN KEY (furniture_class)
-                REFERENCES furniture(furniture_class)
-                ON UPDATE CASCADE
-                ON DELETE RESTRICT,
-
-            CHECK (item_mass > 0),
-            CHECK (ons_price IS NULL OR ons_price > 0),
-            CHECK (defra_spend_factor_CO2 > 0)    
-        );
-        """)
-
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_item_dict_furniture_class
-            ON item_dictionary (furniture_class);
-        """)
-
-        # -------------------------------------
-        # FURNITURE (curated vocab)
-        # Stores category level data
-        # From mapping_list.xlsx sheet: "furniture_class"
-        # -------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS furniture (
-            furniture_class TEXT PRIMARY KEY,
-            furniture_description TEXT,
-            class_contains TEXT,
-            kgC_kg REAL NOT NULL,
-            ratio_fossil REAL NOT NULL,
-            ratio_biog REAL NOT NULL,
-            notes TEXT,
-
-            CHECK (kgC_kg >= 0),
-            CHECK (ratio_fossil >= 0 AND ratio_fossil <= 1),
-            CHECK (ratio_biog >= 0 AND ratio_biog <= 1),
-            CHECK (ratio_fossil + ratio_biog BETWEEN 0.99 AND 1.01)
-        );
-        """)
-
-        # -------------------------------------
-        # ROOM (curated vocab)
-        # From mapping_list.xlsx sheet: "room_type"
-        # -------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS room (
-            room_type TEXT PRIMARY KEY,
-            room_description TEXT NOT NULL UNIQUE,
-            room_size_m2 REAL NOT NULL,
-            size_assumed INTEGER,
-            room_type_comp_1 TEXT,
-            room_type_comp_2 TEXT,
-            room_type_comp_ratio REAL,
-            assumption_notes TEXT,
-            notes TEXT,
-            FOREIGN KEY (room_type_comp_1) REFERENCES room(room_type),
-            FOREIGN KEY (room_type_comp_2) REFERENCES room(room_type),
-            CHECK (
-                room_type_comp_ratio IS NULL
-                OR room_type_comp_ratio >= 0
-            )
-        );
-        """)
-
-
-        # -------------------------------------
-        # ASSUMED INVENTORY
-        # Build assumed inventory table headings & type
-        # -------------------------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS assumed_inventory (
-            assumed_item_id INTEGER PRIMARY KEY,
-            room_type TEXT NOT NULL,
-            item_name TEXT NOT NULL,
-            count_assumed INTEGER NOT NULL,
-            dependency TEXT,
-            dependency_type TEXT,
-            dependency_quantifier REAL,
-            assumption_notes TEXT,
-            FOREIGN KEY (room_type) REFERENCES room(room_type),
-            FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
-            UNIQUE (item_name, room_type),
-            CHECK (count_assumed >= 0),
-            CHECK (
-                dependency_type IS NULL
-                OR dependency_type IN ('item_name', 'room_type')
-            ),
-            CHECK (
-                dependency_quantifier IS NULL
-                OR dependency_quantifier >= 0
-            )
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_assumed_room
-            ON assumed_inventory (room_type);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_assumed_item_name
-            ON assumed_inventory (item_name);
-        """)
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_assumed_dependency
-            ON assumed_inventory (dependency_type, dependency);
-        """)
-
-
-        # -----------------------
-        # INGEST LOG
-        # Simple audit trail
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS ingest_log (
-            ingest_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            source_id TEXT,
-            data_source_type TEXT,
-            action TEXT,
-            status TEXT,
-            message TEXT,
-            started_utc TEXT,
-            finished_utc TEXT,
-            rows_inserted INTEGER,
-            rows_deleted INTEGER,
-            FOREIGN KEY (source_id) REFERENCES sources(source_id) ON DELETE SET NULL
-        );
-        """)
-
-        # -----------------------
-        # ITEM COUNT DISTRIBUTION
-        # Count probability distribution
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS item_count_pmf (
-            item_pmf_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_name TEXT NOT NULL,
-            room_type TEXT NOT NULL,
-            count_value INTEGER NOT NULL,
-            item_frequency INTEGER,
-            item_probability REAL,
-            item_pmf_notes TEXT,
-            FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
-            FOREIGN KEY (room_type) REFERENCES room(room_type)
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_item_count_pmf_item_room
-            ON item_count_pmf (item_name, room_type)
-        """)
-
-        # -----------------------
-        # ITEM COUNT SUMMARY
-        # Count probality summary
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS item_count_summary (
-            item_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_name TEXT NOT NULL,
-            room_type TEXT NOT NULL,
-            expected_count_mean REAL NOT NULL,
-            count_q25 REAL,
-            count_q75 REAL,
-            count_summary_notes TEXT,
-            FOREIGN KEY (item_name) REFERENCES item_dictionary(item_name),
-            FOREIGN KEY (room_type) REFERENCES room(room_type),
-            CHECK (expected_count_mean >= 0.0),
-            CHECK (count_q25 IS NULL OR count_q25 >= 0.0),
-            CHECK (count_q75 IS NULL OR count_q75 >= 0.0),
-            UNIQUE (item_name, room_type)
-        )
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_item_count_summary_item_room
-            ON item_count_summary (item_name, room_type)
-        """)
-
-
-        # -----------------------
-        # ROOM COUNT DISTRIBUTION
-        # Count probability distribution
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS room_count_pmf (
-            room_pmf_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_type TEXT NOT NULL,
-            count_value INTEGER NOT NULL,
-            room_frequency INTEGER,
-            room_probability REAL,
-            room_pmf_notes TEXT,
-            FOREIGN KEY (room_type) REFERENCES room(room_type)
-        )
-        """)
-
-
-        # -----------------------
-        # ROOM COUNT SUMMARY
-        # Count probality summary
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS room_count_summary (
-            room_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_type TEXT NOT NULL,
-            expected_count_mean REAL,
-            count_q25 REAL,
-            count_q75 REAL,
-            count_summary_notes TEXT,
-            FOREIGN KEY (room_type) REFERENCES room(room_type),
-            CHECK (expected_count_mean >= 0.0),
-            CHECK (count_q25 IS NULL OR count_q25 >= 0.0),
-            CHECK (count_q75 IS NULL OR count_q75 >= 0.0),
-            UNIQUE (room_type)
-        )
-        """)
-
-        # -----------------------
-        # CARBON STOCK SUMMARY
-        # Room level carbon mass
-        # -----------------------
-        cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS room_carbon_stock (
-            carbon_summary_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_type TEXT NOT NULL UNIQUE,
-            expected_total_carbon_kgC REAL,
-            expected_biog_carbon_kgC REAL,
-            expected_fossil_carbon_kgC REAL,
-            q25_total_carbon_kgC REAL,
-            q25_biog_carbon_kgC REAL,
-            q25_fossil_carbon_kgC REAL,
-            q75_total_carbon_kgC REAL,
-            q75_biog_carbon_kgC REAL,
-            q75_fossil_carbon_kgC REAL,
-            carbon_notes TEXT,
-
-            FOREIGN KEY (room_type) REFERENCES room(room_type)
-        );
-        """)
-
-        # Speed up queries based on commonly used variables
-        cur.execute("""
-            CREATE INDEX IF NOT EXISTS idx_room_carbon_stock_room
-            ON room_carbon_stock (room_type)
-        """)
-
-
-        # -----------------------
-        # EMBODIED CO2 SUMMARY
-        # Room level replacement embodied CO2 emissions
-        # -----------------------
-        cur.execute(
-        """
-        CREATE TABLE IF NOT EXISTS room_embodied_CO2 (
-            room_embodied_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            room_type TEXT NOT NULL UNIQUE,
-
-            expected_embodied_CO2_kg REAL,
-            q25_embodied_CO2_kg REAL,
-            q75_embodied_CO2_kg REAL,
-
-            embodied_CO2_notes TEXT,
-
-            FOREIGN KEY (room_type)
-                REFERENCES room(room_type)
-                ON UPDATE CASCADE
-                ON DELETE RESTRICT,
-
-            CHECK (expected_embodied_CO2_kg IS NULL OR expected_embodied_CO2_kg >= 0),
-            CHECK (q25_embodied_CO2_kg IS NULL OR q25_embodied_CO2_kg >= 0),
-            CHECK (q75_embodied_CO2_kg IS NULL OR q75_embodied_CO2_kg >= 0)
-        );
-        """)
-        
-        # -----------------------
-        # DELLING SIZE
-        # Dwelling level data
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS dwelling_size (
-            dwelling_type TEXT PRIMARY KEY,
-            dwelling_size_m2 REAL,
-            count_value INTEGER,
-            dwelling_type_pmf REAL,
-            dwelling_notes TEXT
-        )
-        """)
-
-        # -----------------------
-        # EMBODIED CARBON DATA
-        # Spend-based embodied carbon data
-        # -----------------------
-        cur.execute("""
-        CREATE TABLE IF NOT EXISTS embodied_carbon_data (
-            embodied_carbon_id INTEGER PRIMARY KEY AUTOINCREMENT,
-            item_name TEXT NOT NULL,
-            amazon_price_top_1 REAL,
-            amazon_price_top_2 REAL,
-            amazon_price_top_3 REAL,
-            amazon_price_top_4 REAL,
-            amazon_price_top_5 REAL,
-            amazon_price_top_6 REAL,
-            amazon_price_top_7 REAL,
-            amazon_price_top_8 REAL,
-            amazon_price_top_9 REAL,
-            amazon_price_top_10 REAL,
-            amazon_price_mean REAL,
-            amazon_price_std REAL,
-            amazon_price_upper REAL,
-            replacement_cost_adjusted REAL,             
-            embodied_CO2_kg REAL,
-            notes TEXT,
-
-            FOREIGN KEY (item_name)
-                REFERENCES item_dictionary(item_name)
-                ON UPDATE CASCADE
-                ON DELETE RESTRICT,
-
-            UNIQUE (item_name),
-
-            CHECK (amazon_price_top_1 IS NULL OR amazon_price_top_1 > 0),
-            CHECK (amazon_price_top_2 IS NULL OR amazon_price_top_2 > 0),
-            CHECK (amazon_price_top_3 IS NULL OR amazon_price_top_3 > 0),
-            CHECK (amazon_price_top_4 IS NULL OR amazon_price_top_4 > 0),
-            CHECK (amazon_price_top_5 IS NULL OR amazon_price_top_5 > 0),
-            CHECK (amazon_price_top_6 IS NULL OR amazon_price_top_6 > 0),
-            CHECK (amazon_price_top_7 IS NULL OR amazon_price_top_7 > 0),
-            CHECK (amazon_price_top_8 IS NULL OR amazon_price_top_8 > 0),
-            CHECK (amazon_price_top_9 IS NULL OR amazon_price_top_9 > 0),
-            CHECK (amazon_price_top_10 IS NULL OR amazon_price_top_10 > 0),
-            CHECK (amazon_price_mean IS NULL OR amazon_price_mean > 0),
-            CHECK (amazon_price_std IS NULL OR amazon_price_std >= 0),
-            CHECK (amazon_price_upper IS NULL OR amazon_price_upper > 0),
-            CHECK (replacement_cost_adjusted IS NULL OR replacement_cost_adjusted > 0),
-            CHECK (embodied_CO2_kg IS NULL OR embodied_CO2_kg > 0)
-        )
-        """)
+        apply_connection_pragmas(con)  # busy_timeout, WAL, synchronous, cache_size, temp_store, mmap_size
+
+        # Skips the DDL entirely if this database already carries the current schema
+        if cur.execute("PRAGMA user_version;").fetchone()[0] >= SCHEMA_VERSION:
+            print(f"Database already initialised (schema v{SCHEMA_VERSION}): {db_path}")
+            return
 
-        # Write changes and print confirmation in terminal
-        con.commit()
+        # Creates every table and index in one script / one transaction
+        con.executescript(_SCHEMA_DDL)
+
+        # Print confirmation in terminal (the script above already committed)
         print(f"Initialised blank database at: {db_path}")
 
     # Ensures connection is always closed cleanly, regardless of any other actions
+    finally:
+        if owns_con:
+            con.close()
+
+
+# FUNCTION: create the schema and load the mapping_list in one connection
+def bootstrap(db_path: str | Path, xlsx_path: str | Path, mode: str = "replace_all") -> None:
+    """
+    Initialise the database and ingest the mapping_list in a single session.
+
+    One connection serves both phases, so the page cache stays warm between
+    the DDL and the vocab load and only one connect/close is paid.
+    """
+    # Imported here so plain schema init does not need pandas
+    from scripts.inventory.vocab import ingest_mapping_list_pandas_conn
+
+    db_path = Path(db_path)
+    db_path.parent.mkdir(parents=True, exist_ok=True)
+
+    con = db_connect(db_path, isolation_level=None, cached_statements=256)
+    try:
+        init_database(str(db_path), con=con)
+        ingest_mapping_list_pandas_conn(con, xlsx_path=xlsx_path, mode=mode)
     finally:
         con.close()
 
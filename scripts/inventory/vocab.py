@@ -2,14 +2,17 @@
 from __future__ import annotations
 
 import sqlite3
-from dataclasses import dataclass
+from dataclasses import dataclass, fields
+from operator import attrgetter
 from pathlib import Path
-from typing import Optional, Tuple, List
+from typing import Iterator, List, Optional, Tuple
 
 import pandas as pd
 
+from scripts.ingest_utils import db_connect
+
 # Create classes
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ItemRow:
     item_name: str
     item_description: str
@@ -20,7 +23,7 @@ class ItemRow:
     furniture_class: str
     notes: Optional[str]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class ClassRow:
     furniture_class: str
     furniture_description: str
@@ -30,7 +33,7 @@ class ClassRow:
     ratio_biog: float
     notes: Optional[str]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class RoomRow:
     room_type: str
     room_description: str
@@ -41,7 +44,7 @@ class RoomRow:
     room_type_comp_ratio: Optional[float]
     assumption_notes: Optional[str]
 
-@dataclass(frozen=True)
+@dataclass(frozen=True, slots=True)
 class DwellingSizeRow:
     dwelling_type: str
     dwelling_size_m2: float
@@ -49,6 +52,27 @@ class DwellingSizeRow:
     dwelling_type_pmf: float
     dwelling_notes: Optional[str]
 
+# Required columns per mapping_list sheet (rows missing any of these are dropped)
+_REQUIRED_COLS = {
+    "item_name": [
+        "item_name",
+        "item_description",
+        "item_mass",
+        "defra_spend_factor_CO2",
+        "furniture_class",
+    ],
+    "furniture_class": [
+        "furniture_class",
+        "furniture_description",
+        "class_contains",
+        "kgC_kg",
+        "ratio_fossil",
+        "ratio_biog",
+    ],
+    "room_type": ["room_type", "room_description", "room_size_m2"],
+    "dwelling_size": ["dwelling_type", "dwelling_size_m2", "dwelling_count"],
+}
+
 # Private function
 def _require_cols(df: pd.DataFrame, required: list[str], sheet: str) -> None:
     """Checks the DataFrame contains the required columns"""
@@ -73,6 +97,10 @@ def _coerce_optional_numeric_column(
         df[col] = None
         return
 
+    # Already numeric (blanks read as NaN): nothing to clean per cell
+    if pd.api.types.is_numeric_dtype(df[col]) and not pd.api.types.is_bool_dtype(df[col]):
+        return
+
     null_like = {"", "none", "nan", "n/a", "na", "null"}
 
     cleaned = df[col].map(
@@ -89,6 +117,69 @@ def _coerce_optional_numeric_column(
         ) from e
 
 
+# Private function
+def _row_params(rows: list) -> Iterator[tuple]:
+    """
+    Yields each (slotted) row dataclass as a plain tuple in field order,
+    ready for executemany. The vocab SQL lists its columns in the same order.
+    """
+    if not rows:
+        return iter(())
+    return map(attrgetter(*(f.name for f in fields(rows[0]))), rows)
+
+
+# Private function
+def _vocab_fk_violations(cur: sqlite3.Cursor) -> list[tuple]:
+    """
+    Runs foreign_key_check on the vocab tables and the tables referencing them,
+    keeping only violations whose parent is a vocab table (the ones this load
+    can cause; pre-existing orphans elsewhere in the DB are not its concern).
+    Returns: (table, rowid, parent, fkid) rows
+    """
+    placeholders = ", ".join("?" for _ in _VOCAB_TABLES)
+    children = [
+        name
+        for (name,) in cur.execute(
+            f"""
+            SELECT DISTINCT m.name
+            FROM sqlite_master AS m
+            JOIN pragma_foreign_key_list(m.name) AS f
+            WHERE m.type = 'table' AND f."table" IN ({placeholders})
+            ORDER BY m.name;
+            """,
+            _VOCAB_TABLES,
+        )
+    ]
+    violations = []
+    for table in children:
+        violations.extend(
+            v for v in cur.execute(f'PRAGMA foreign_key_check("{table}");')
+            if v[2] in _VOCAB_TABLES
+        )
+    return violations
+
+
+# Private function
+def _iter_columns(df: pd.DataFrame, cols: list[str]) -> Iterator[tuple]:
+    """
+    Iterates rows as plain tuples of the given columns.
+    (Zips pre-extracted column arrays: no per-row pandas/namedtuple objects.)
+    """
+    return zip(*(df[c].to_numpy() for c in cols))
+
+
+# Short helper to turn a free-text notes cell into a clean string or None
+def _clean_note(value) -> Optional[str]:
+    """
+    Returns None for missing cells (None / NaN / pd.NA) and blank text;
+    anything else is returned as a stripped string (so a literal "None" note survives).
+    """
+    if value is None or (not isinstance(value, str) and pd.isna(value)):
+        return None
+    text = str(value).strip()
+    return text or None
+
+
 # Short helper to allow SQLite to handle Pandas/Excel booleans correctly 
 def coerce_boolish(value):
     """Normalizes text and converts boolean string to SQLite-friendly 0s and 1s"""
@@ -106,40 +197,129 @@ def coerce_boolish(value):
 
     raise ValueError(f"Invalid boolean-like value for size_assumed: {value!r}")
 
+# Pick the pandas Excel engine for a requested backend
+def _excel_engine(backend: str) -> str:
+    """
+    Returns the pandas read_excel engine to use for the requested backend.
+
+    "calamine" (Rust-backed, much faster than openpyxl) needs pandas >= 2.2 and
+    the python-calamine package; falls back to "openpyxl" if either is missing.
+    """
+    if backend == "openpyxl":
+        return backend
+    if backend != "calamine":
+        raise ValueError("backend must be 'calamine' or 'openpyxl'")
+
+    pandas_version = tuple(int(p) for p in pd.__version__.split(".")[:2] if p.isdigit())
+    if pandas_version < (2, 2):
+        return "openpyxl"
+    try:
+        import python_calamine  # noqa: F401
+    except ImportError:
+        return "openpyxl"
+    return "calamine"
+
+# Streams one worksheet, keeping only rows that have every required cell
+def _sheet_to_records(ws, required: list[str]) -> Tuple[List[str], List[dict]]:
+    """
+    Reads a (read-only) openpyxl worksheet into header + row dicts.
+
+    Rows with an empty required cell are skipped before pandas sees them, so
+    trailing blank rows (which openpyxl still reports up to max_row) are
+    never materialised. Empty / whitespace-only strings count as empty.
+    Returns (header, records); header names are whitespace-stripped.
+    """
+    rows = ws.iter_rows(values_only=True)
+    header_row = next(rows, ())
+    header = [
+        f"Unnamed: {i}" if h is None else str(h).strip()
+        for i, h in enumerate(header_row)
+    ]
+    req_idx = [header.index(c) for c in required if c in header]
+
+    records = []
+    for row in rows:
+        values = [
+            None if isinstance(v, str) and not v.strip() else v
+            for v in row
+        ]
+        if len(values) < len(header):
+            values.extend([None] * (len(header) - len(values)))
+        if any(values[i] is None for i in req_idx):
+            continue
+        records.append(dict(zip(header, values)))
+
+    return header, records
+
+# Loads the mapping_list sheets through the read-only openpyxl pre-filter
+def _read_sheets_openpyxl(xlsx_path: Path) -> dict[str, pd.DataFrame]:
+    """Opens the workbook once (read_only, cached values) and returns one DataFrame per sheet."""
+    from openpyxl import load_workbook
+
+    wb = load_workbook(xlsx_path, read_only=True, data_only=True)
+    try:
+        sheets = {}
+        for sheet_name, required in _REQUIRED_COLS.items():
+            # Same error as pandas' read_excel, so callers see one error whichever backend ran
+            if sheet_name not in wb.sheetnames:
+                raise ValueError(f"Worksheet named '{sheet_name}' not found")
+            header, records = _sheet_to_records(wb[sheet_name], required)
+            sheets[sheet_name] = pd.DataFrame.from_records(records, columns=header)
+        return sheets
+    finally:
+        wb.close()
+
 def read_mapping_list_xlsx_pandas(
-    xlsx_path: str | Path
+    xlsx_path: str | Path,
+    *,
+    backend: str = "calamine",
 ) -> Tuple[List[ItemRow], List[ClassRow], List[RoomRow], List[DwellingSizeRow]]:
     """
     Reads and validates the mapping_list.
     Ensures the data is suitable for ingestion.
-    Input: xlsx file
+    Input: xlsx file (read with the given backend: "calamine" by default,
+           falling back to "openpyxl" if unavailable; or "openpyxl" explicitly)
     Returns: validated data {items, classes, rooms}
     """
     xlsx_path = Path(xlsx_path)
+    engine = _excel_engine(backend)
+
+    # Loads all four sheets in one call (workbook opened and parsed once)
+    # calamine parses the whole sheet natively; the openpyxl route streams rows
+    # and drops incomplete ones before building DataFrames
+    if engine == "calamine":
+        # Only truly empty cells are missing (as on the openpyxl route), so text
+        # such as "None" or "NA" in a notes cell is kept rather than read as NaN
+        sheets = pd.read_excel(
+            xlsx_path,
+            sheet_name=list(_REQUIRED_COLS),
+            engine=engine,
+            keep_default_na=False,
+            na_values=[""],
+        )
+    else:
+        sheets = _read_sheets_openpyxl(xlsx_path)
 
     # ---- item_name ----
-    # Loads the "item_name" sheet into a DataFrame
-    df_items = pd.read_excel(xlsx_path, sheet_name="item_name", engine="openpyxl")
+    df_items = sheets["item_name"]
     # Strips header whitespace
     df_items.columns = [str(c).strip() for c in df_items.columns]
 
     # Ensures headers exist
-    req_items = [
-        "item_name",
-        "item_description",
-        "item_mass",
-        "defra_spend_factor_CO2",
-        "furniture_class"
-    ]
+    req_items = _REQUIRED_COLS["item_name"]
     _require_cols(df_items, req_items, "item_name")
 
     # Drop rows missing required fields
     df_items = df_items.dropna(subset=req_items)
 
     # Normalise key id strings (prevent duplication on lower/upper-case mismatch)
-    df_items["item_name"] = df_items["item_name"].astype(str).str.strip().str.lower()
-    df_items["item_description"] = df_items["item_description"].astype(str).str.strip()
-    df_items["furniture_class"] = df_items["furniture_class"].astype(str).str.strip().str.lower()
+    # (one cast to the pandas string dtype, then string kernels work on it directly)
+    df_items = df_items.astype(
+        {"item_name": "string", "item_description": "string", "furniture_class": "string"}
+    )
+    df_items["item_name"] = df_items["item_name"].str.strip().str.lower()
+    df_items["item_description"] = df_items["item_description"].str.strip()
+    df_items["furniture_class"] = df_items["furniture_class"].str.strip().str.lower()
 
     # Ensure numeric
     df_items["item_mass"] = pd.to_numeric(df_items["item_mass"],
@@ -180,17 +360,26 @@ def read_mapping_list_xlsx_pandas(
     if "notes" not in df_items.columns:
         df_items["notes"] = None
     else:
-        df_items["notes"] = df_items["notes"].astype(str).where(df_items["notes"].notna(), None)
+        df_items["notes"] = df_items["notes"].where(df_items["notes"].notna(), None)
 
     # Ensure item_name (primary key) is unique
-    if df_items["item_name"].duplicated().any():
-        dups = df_items.loc[df_items["item_name"].duplicated(), "item_name"].tolist()
-        raise ValueError(f"[item_name] Duplicate item_name(s): {dups[:20]}")
+    dup_mask = df_items["item_name"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_items.loc[dup_mask, "item_name"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[item_name] Duplicate item_name(s): {dups}")
+
+    # Ensure item_description (UNIQUE) is unique
+    # (a clash would otherwise surface as a bare IntegrityError at insert time)
+    dup_mask = df_items["item_description"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_items.loc[dup_mask, "item_description"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[item_name] Duplicate item_description(s): {dups}")
 
     # Ensure positive mass
-    if (df_items["item_mass"] <= 0).any():
-        bad = df_items.loc[df_items["item_mass"] <= 0, "item_name"].tolist()
-        raise ValueError(f"[item_name] item_mass must be > 0 for: {bad[:20]}")
+    bad_mask = df_items["item_mass"] <= 0
+    if bad_mask.any():
+        bad = df_items.loc[bad_mask, "item_name"].head(20).tolist()
+        raise ValueError(f"[item_name] item_mass must be > 0 for: {bad}")
 
     # Ensure item-level DEFRA spend-based CO2 factors are positive.
     bad_defra_factor = df_items.loc[
@@ -203,41 +392,13 @@ def read_mapping_list_xlsx_pandas(
             f"[item_name] defra_spend_factor_CO2 must be > 0 for: {bad_defra_factor[:20]}"
         )
 
-    # Convert to dataclasses (and detaches from pandas types)
-    items = [
-        ItemRow(
-            item_name=r.item_name,
-            item_description=r.item_description,
-            item_mass=float(r.item_mass),
-            ons_price=None if pd.isna(r.ons_price) else float(r.ons_price),
-            price_search_term=(
-                None
-                if r.price_search_term is None
-                or str(r.price_search_term).strip() in {"", "None", "nan"}
-                else str(r.price_search_term).strip()
-            ),
-            defra_spend_factor_CO2=float(r.defra_spend_factor_CO2),
-            furniture_class=r.furniture_class,
-            notes=None if r.notes in ("None", "nan") else r.notes,
-        )
-        for r in df_items.itertuples(index=False)
-    ]
-
     # ---- furniture_class ----
-    # Loads the "furniture_class" sheet into a DataFrame
-    df_cls = pd.read_excel(xlsx_path, sheet_name="furniture_class", engine="openpyxl")
+    df_cls = sheets["furniture_class"]
     # Strips header whitespace
     df_cls.columns = [str(c).strip() for c in df_cls.columns]
 
     # Ensures headers exist
-    req_cls = [
-        "furniture_class",
-        "furniture_description",
-        "class_contains",
-        "kgC_kg",
-        "ratio_fossil",
-        "ratio_biog",
-    ]
+    req_cls = _REQUIRED_COLS["furniture_class"]
     _require_cols(df_cls, req_cls, "furniture_class")
     
     # Drop rows missing required fields
@@ -245,9 +406,12 @@ def read_mapping_list_xlsx_pandas(
     df_cls = df_cls.dropna(subset=req_cls)
 
     # Normalise key id strings (prevent duplication on lower/upper-case mismatch)
-    df_cls["furniture_class"] = df_cls["furniture_class"].astype(str).str.strip().str.lower()
-    df_cls["furniture_description"] = df_cls["furniture_description"].astype(str).str.strip()
-    df_cls["class_contains"] = df_cls["class_contains"].astype(str).str.strip()
+    df_cls = df_cls.astype(
+        {"furniture_class": "string", "furniture_description": "string", "class_contains": "string"}
+    )
+    df_cls["furniture_class"] = df_cls["furniture_class"].str.strip().str.lower()
+    df_cls["furniture_description"] = df_cls["furniture_description"].str.strip()
+    df_cls["class_contains"] = df_cls["class_contains"].str.strip()
     
     # Ensure numeric values
     df_cls["kgC_kg"] = pd.to_numeric(df_cls["kgC_kg"], errors="raise")
@@ -258,72 +422,104 @@ def read_mapping_list_xlsx_pandas(
     if "notes" not in df_cls.columns:
         df_cls["notes"] = None
     else:
-        df_cls["notes"] = df_cls["notes"].astype(str).where(df_cls["notes"].notna(), None)
+        df_cls["notes"] = df_cls["notes"].where(df_cls["notes"].notna(), None)
 
     # Ensure furniture_class (primary key) is unique
-    if df_cls["furniture_class"].duplicated().any():
-        dups = df_cls.loc[df_cls["furniture_class"].duplicated(), "furniture_class"].tolist()
-        raise ValueError(f"[furniture_class] Duplicate furniture_class(es): {dups[:20]}")
+    dup_mask = df_cls["furniture_class"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_cls.loc[dup_mask, "furniture_class"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[furniture_class] Duplicate furniture_class(es): {dups}")
 
     # Ensure carbon:item ratio is between 0-1
-    if ((df_cls["kgC_kg"] <= 0) | (df_cls["kgC_kg"] >= 1)).any():
-        bad = df_cls.loc[(df_cls["kgC_kg"] <= 0) | (df_cls["kgC_kg"] >= 1), "furniture_class"].tolist()
-        raise ValueError(f"[furniture_class] kgC_kg must be in (0,1) for: {bad[:20]}")
+    bad_mask = (df_cls["kgC_kg"] <= 0) | (df_cls["kgC_kg"] >= 1)
+    if bad_mask.any():
+        bad = df_cls.loc[bad_mask, "furniture_class"].head(20).tolist()
+        raise ValueError(f"[furniture_class] kgC_kg must be in (0,1) for: {bad}")
 
 
     # Ensure carbon source ratios are from 0-1.
-    bad_rf = df_cls.loc[
-        (df_cls["ratio_fossil"] < 0) | (df_cls["ratio_fossil"] > 1),
-        "furniture_class"
-    ].tolist()
+    rf = df_cls["ratio_fossil"]
+    rb = df_cls["ratio_biog"]
 
-    if bad_rf:
+    bad_rf = (rf < 0) | (rf > 1)
+    if bad_rf.any():
+        bad = df_cls.loc[bad_rf, "furniture_class"].head(20).tolist()
         raise ValueError(
-            f"[furniture_class] ratio_fossil must be in [0,1] for: {bad_rf[:20]}"
+            f"[furniture_class] ratio_fossil must be in [0,1] for: {bad}"
         )
 
-    bad_rb = df_cls.loc[
-        (df_cls["ratio_biog"] < 0) | (df_cls["ratio_biog"] > 1),
-        "furniture_class"
-    ].tolist()
-
-    if bad_rb:
+    bad_rb = (rb < 0) | (rb > 1)
+    if bad_rb.any():
+        bad = df_cls.loc[bad_rb, "furniture_class"].head(20).tolist()
         raise ValueError(
-            f"[furniture_class] ratio_biog must be in [0,1] for: {bad_rb[:20]}"
+            f"[furniture_class] ratio_biog must be in [0,1] for: {bad}"
         )
 
     # Allow a small tolerance around 1.0 to avoid floating point / rounding issues.
-    ratio_sum = df_cls["ratio_fossil"] + df_cls["ratio_biog"]
-
-    sum_bad = df_cls.loc[
-        (ratio_sum < 0.99) | (ratio_sum > 1.01),
-        "furniture_class"
-    ].tolist()
+    # Only rows with both ratios present can fail (a NaN sum never did).
+    both = rf.notna() & rb.notna()
+    ratio_sum = rf[both] + rb[both]
+    sum_mask = (ratio_sum < 0.99) | (ratio_sum > 1.01)
 
-    if sum_bad:
+    if sum_mask.any():
+        sum_bad = df_cls.loc[both, "furniture_class"][sum_mask].head(20).tolist()
         raise ValueError(
             "[furniture_class] ratio_fossil + ratio_biog must be between "
             "0.99 and 1.01 for: "
-            + ", ".join(sum_bad[:20])
+            + ", ".join(sum_bad)
+        )
+
+    # Ensure every item's furniture_class exists in class table
+    # (vectorised on the cleaned DataFrames, before any dataclasses are built)
+    missing_mask = ~df_items["furniture_class"].isin(df_cls["furniture_class"])
+    if missing_mask.any():
+        missing = sorted(df_items.loc[missing_mask, "furniture_class"].unique().tolist())
+        raise ValueError("Items reference furniture_class not present in furniture_class sheet: " + ", ".join(missing[:20]))
+
+    # Convert to dataclasses (and detaches from pandas types)
+    items = [
+        ItemRow(
+            item_name=name,
+            item_description=desc,
+            item_mass=float(mass),
+            ons_price=None if pd.isna(ons) else float(ons),
+            price_search_term=(
+                None
+                if term is None
+                or str(term).strip() in {"", "None", "nan"}
+                else str(term).strip()
+            ),
+            defra_spend_factor_CO2=float(defra),
+            furniture_class=fclass,
+            notes=_clean_note(notes),
+        )
+        for name, desc, mass, ons, term, defra, fclass, notes in _iter_columns(
+            df_items,
+            ["item_name", "item_description", "item_mass", "ons_price",
+             "price_search_term", "defra_spend_factor_CO2", "furniture_class", "notes"],
         )
+    ]
 
     # Build ClassRow objects.
     classes = [
         ClassRow(
-            furniture_class=str(r.furniture_class).strip().lower(),
-            furniture_description=str(r.furniture_description).strip(),
-            class_contains=str(r.class_contains).strip(),
-            kgC_kg=float(r.kgC_kg),
-            ratio_fossil=float(r.ratio_fossil),
-            ratio_biog=float(r.ratio_biog),
-            notes=None if (r.notes is None or str(r.notes).strip() == "") else str(r.notes).strip(),
+            furniture_class=str(fclass).strip().lower(),
+            furniture_description=str(desc).strip(),
+            class_contains=str(contains).strip(),
+            kgC_kg=float(kgc),
+            ratio_fossil=float(rf),
+            ratio_biog=float(rb),
+            notes=_clean_note(notes),
+        )
+        for fclass, desc, contains, kgc, rf, rb, notes in _iter_columns(
+            df_cls,
+            ["furniture_class", "furniture_description", "class_contains",
+             "kgC_kg", "ratio_fossil", "ratio_biog", "notes"],
         )
-        for r in df_cls.itertuples(index=False)
     ]
     
     # ---- room_type ----
-    # Loads the "room_type" sheet into a DataFrame
-    df_rooms = pd.read_excel(xlsx_path, sheet_name="room_type", engine="openpyxl")
+    df_rooms = sheets["room_type"]
     # Strips header whitespace
     df_rooms.columns = [str(c).strip() for c in df_rooms.columns]
 
@@ -337,12 +533,12 @@ def read_mapping_list_xlsx_pandas(
         df_rooms["room_size_m2"] = pd.to_numeric(df_rooms["room_size_m2"], errors="coerce")
 
     # Drop rows missing required fields (room_type, room_description, room_size_m2)
-    req_rooms = ["room_type", "room_description", "room_size_m2"]
+    req_rooms = _REQUIRED_COLS["room_type"]
     _require_cols(df_rooms, req_rooms, "room_size_m2")
     df_rooms = df_rooms.dropna(subset=req_rooms)
     
     # Normalise key id strings
-    df_rooms["room_type"] = df_rooms["room_type"].astype(str).str.strip().str.lower()
+    df_rooms["room_type"] = df_rooms["room_type"].astype("string").str.strip().str.lower()
 
     # Optional columns
     if "size_assumed" not in df_rooms.columns:
@@ -380,16 +576,21 @@ def read_mapping_list_xlsx_pandas(
     if "assumption_notes" not in df_rooms.columns:
         df_rooms["assumption_notes"] = None
     else:
-        df_rooms["assumption_notes"] = (
-            df_rooms["assumption_notes"]
-            .astype(str)
-            .where(df_rooms["assumption_notes"].notna(), None)
+        df_rooms["assumption_notes"] = df_rooms["assumption_notes"].where(
+            df_rooms["assumption_notes"].notna(), None
         )
 
     # Ensure room_type (primary key) is unique
-    if df_rooms["room_type"].duplicated().any():
-        dups = df_rooms.loc[df_rooms["room_type"].duplicated(), "room_type"].tolist()
-        raise ValueError(f"[room_type] Duplicate room_type(s): {dups[:20]}")
+    dup_mask = df_rooms["room_type"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_rooms.loc[dup_mask, "room_type"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[room_type] Duplicate room_type(s): {dups}")
+
+    # Ensure room_description (UNIQUE) is unique
+    dup_mask = df_rooms["room_description"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_rooms.loc[dup_mask, "room_description"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[room_type] Duplicate room_description(s): {dups}")
 
 
     # Validate room_type comparison columns
@@ -456,31 +657,34 @@ def read_mapping_list_xlsx_pandas(
     # Convert to dataclasses
     rooms = [
         RoomRow(
-            r.room_type,
-            r.room_description,
-            float(r.room_size_m2),
-            coerce_boolish(r.size_assumed),
-            r.room_type_comp_1,
-            r.room_type_comp_2,
-            None if pd.isna(r.room_type_comp_ratio) else float(r.room_type_comp_ratio),
-            None if r.assumption_notes in ("None", "nan") else r.assumption_notes,
+            room_type,
+            desc,
+            float(size),
+            coerce_boolish(assumed),
+            comp_1,
+            comp_2,
+            None if pd.isna(comp_ratio) else float(comp_ratio),
+            _clean_note(notes),
+        )
+        for room_type, desc, size, assumed, comp_1, comp_2, comp_ratio, notes in _iter_columns(
+            df_rooms,
+            ["room_type", "room_description", "room_size_m2", "size_assumed",
+             "room_type_comp_1", "room_type_comp_2", "room_type_comp_ratio", "assumption_notes"],
         )
-        for r in df_rooms.itertuples(index=False)
     ]
 
     # ---- dwelling_size ----
-    # Loads the "dwelling_size" sheet into a DataFrame 
-    df_dwelling = pd.read_excel(xlsx_path, sheet_name="dwelling_size", engine="openpyxl")
+    df_dwelling = sheets["dwelling_size"]
     # Strips header whitespace
     df_dwelling.columns = [str(c).strip() for c in df_dwelling.columns]
 
     # Drop rows missing required fields (room_type, room_description, room_size_m2)
-    req_dwelling = ["dwelling_type", "dwelling_size_m2", "dwelling_count"]
+    req_dwelling = _REQUIRED_COLS["dwelling_size"]
     _require_cols(df_dwelling, req_dwelling, "dwelling_size")
     df_dwelling = df_dwelling.dropna(subset=req_dwelling)
 
     # Normalise key id strings
-    df_dwelling["dwelling_type"] = df_dwelling["dwelling_type"].astype(str).str.strip().str.lower()
+    df_dwelling["dwelling_type"] = df_dwelling["dwelling_type"].astype("string").str.strip().str.lower()
     
     # Ensure numeric
     df_dwelling["dwelling_size_m2"] = pd.to_numeric(df_dwelling["dwelling_size_m2"], errors="raise")
@@ -490,23 +694,26 @@ def read_mapping_list_xlsx_pandas(
     if "dwelling_notes" not in df_dwelling.columns:
         df_dwelling["dwelling_notes"] = None
     else:
-        df_dwelling["dwelling_notes"] = df_dwelling["dwelling_notes"].astype(str).where(
+        df_dwelling["dwelling_notes"] = df_dwelling["dwelling_notes"].where(
             df_dwelling["dwelling_notes"].notna(), None
         )
 
     # Ensure dwelling_type (primary key) is unique
-    if df_dwelling["dwelling_type"].duplicated().any():
-        dups = df_dwelling.loc[df_dwelling["dwelling_type"].duplicated(), "dwelling_type"].tolist()
-        raise ValueError(f"[dwelling_size] Duplicate dwelling_type(s): {dups[:20]}")
+    dup_mask = df_dwelling["dwelling_type"].duplicated(keep=False)
+    if dup_mask.any():
+        dups = df_dwelling.loc[dup_mask, "dwelling_type"].drop_duplicates().head(20).tolist()
+        raise ValueError(f"[dwelling_size] Duplicate dwelling_type(s): {dups}")
 
     # Ensure dwelling size positive non-zero value
-    if (df_dwelling["dwelling_size_m2"] <= 0).any():
-        bad = df_dwelling.loc[df_dwelling["dwelling_size_m2"] <= 0, "dwelling_type"].tolist()
-        raise ValueError(f"[dwelling_size] dwelling_size_m2 must be > 0 for: {bad[:20]}")
+    bad_mask = df_dwelling["dwelling_size_m2"] <= 0
+    if bad_mask.any():
+        bad = df_dwelling.loc[bad_mask, "dwelling_type"].head(20).tolist()
+        raise ValueError(f"[dwelling_size] dwelling_size_m2 must be > 0 for: {bad}")
 
-    if (df_dwelling["dwelling_count"] <= 0).any():
-        bad = df_dwelling.loc[df_dwelling["dwelling_count"] <= 0, "dwelling_type"].tolist()
-        raise ValueError(f"[dwelling_size] dwelling_count must be > 0 for: {bad[:20]}")
+    bad_mask = df_dwelling["dwelling_count"] <= 0
+    if bad_mask.any():
+        bad = df_dwelling.loc[bad_mask, "dwelling_type"].head(20).tolist()
+        raise ValueError(f"[dwelling_size] dwelling_count must be > 0 for: {bad}")
 
     # Create total count
     total_count = int(df_dwelling["dwelling_count"].sum())
@@ -519,40 +726,149 @@ def read_mapping_list_xlsx_pandas(
     # Convert to dataclasses
     dwelling_sizes = [
         DwellingSizeRow(
-            dwelling_type=r.dwelling_type,
-            dwelling_size_m2=float(r.dwelling_size_m2),
-            count_value=int(r.dwelling_count),
-            dwelling_type_pmf=float(r.dwelling_type_pmf),
-            dwelling_notes=None if r.dwelling_notes in ("None", "nan") else r.dwelling_notes,
+            dwelling_type=dwelling_type,
+            dwelling_size_m2=float(size),
+            count_value=int(count),
+            dwelling_type_pmf=float(pmf),
+            dwelling_notes=_clean_note(notes),
+        )
+        for dwelling_type, size, count, pmf, notes in _iter_columns(
+            df_dwelling,
+            ["dwelling_type", "dwelling_size_m2", "dwelling_count",
+             "dwelling_type_pmf", "dwelling_notes"],
         )
-        for r in df_dwelling.itertuples(index=False)
     ]
 
-    # Ensure every item's furniture_class exists in class table
-    class_set = {c.furniture_class for c in classes}
-    missing = sorted({it.furniture_class for it in items if it.furniture_class not in class_set})
-    if missing:
-        raise ValueError("Items reference furniture_class not present in furniture_class sheet: " + ", ".join(missing[:20]))
-
     return items, classes, rooms, dwelling_sizes
 
 
+# In replace_all mode, loads at least this many items with
+# idx_item_dict_furniture_class dropped and rebuilds it once afterwards
+# (below this, per-row index maintenance is cheaper than a rebuild)
+_INDEX_REBUILD_MIN_ITEMS = 500
+
+# Tables written by the mapping_list load (their FKs are checked before commit)
+_VOCAB_TABLES = ("item_dictionary", "furniture", "room", "dwelling_size")
+
+# Insert / upsert statements for each vocab table (module constants, so every
+# load reuses the same SQL text and hits the connection's statement cache).
+# replace_all loads into emptied tables with the plain INSERT, so a repeated
+# primary key is rejected by SQLite. upsert uses ON CONFLICT ... DO UPDATE,
+# which rewrites an existing row in place, rather than INSERT OR REPLACE's
+# delete + re-insert (no FK actions, rowid kept).
+_SQL_INSERT_CLASS = """
+    INSERT INTO furniture
+    (furniture_class, furniture_description, class_contains, kgC_kg,
+    ratio_fossil, ratio_biog, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_CLASS = _SQL_INSERT_CLASS + """
+    ON CONFLICT (furniture_class) DO UPDATE SET
+        furniture_description = excluded.furniture_description,
+        class_contains = excluded.class_contains,
+        kgC_kg = excluded.kgC_kg,
+        ratio_fossil = excluded.ratio_fossil,
+        ratio_biog = excluded.ratio_biog,
+        notes = excluded.notes;
+"""
+
+_SQL_INSERT_ITEM = """
+    INSERT INTO item_dictionary
+    (item_name, item_description, item_mass, price_search_term, ons_price,
+     defra_spend_factor_CO2, furniture_class, notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_ITEM = _SQL_INSERT_ITEM + """
+    ON CONFLICT (item_name) DO UPDATE SET
+        item_description = excluded.item_description,
+        item_mass = excluded.item_mass,
+        ons_price = excluded.ons_price,
+        price_search_term = excluded.price_search_term,
+        defra_spend_factor_CO2 = excluded.defra_spend_factor_CO2,
+        furniture_class = excluded.furniture_class,
+        notes = excluded.notes;
+"""
+
+_SQL_INSERT_ROOM = """
+    INSERT INTO room
+    (room_type, room_description, room_size_m2, size_assumed,
+    room_type_comp_1, room_type_comp_2, room_type_comp_ratio,
+    assumption_notes)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_ROOM = _SQL_INSERT_ROOM + """
+    ON CONFLICT (room_type) DO UPDATE SET
+        room_description = excluded.room_description,
+        room_size_m2 = excluded.room_size_m2,
+        size_assumed = excluded.size_assumed,
+        room_type_comp_1 = excluded.room_type_comp_1,
+        room_type_comp_2 = excluded.room_type_comp_2,
+        room_type_comp_ratio = excluded.room_type_comp_ratio,
+        assumption_notes = excluded.assumption_notes;
+"""
+
+_SQL_INSERT_DWELLING = """
+    INSERT INTO dwelling_size
+    (dwelling_type, dwelling_size_m2, count_value, dwelling_type_pmf, dwelling_notes)
+    VALUES (?, ?, ?, ?, ?)
+"""
+
+_SQL_UPSERT_DWELLING = _SQL_INSERT_DWELLING + """
+    ON CONFLICT (dwelling_type) DO UPDATE SET
+        dwelling_size_m2 = excluded.dwelling_size_m2,
+        count_value = excluded.count_value,
+        dwelling_type_pmf = excluded.dwelling_type_pmf,
+        dwelling_notes = excluded.dwelling_notes;
+"""
+
+
 def ingest_mapping_list_pandas(
     *,
     db_path: str | Path,
     xlsx_path: str | Path,
     mode: str = "replace_all",  # "replace_all" or "upsert"
+    backend: str = "calamine",  # Excel reader: "calamine" (openpyxl fallback) or "openpyxl"
 ) -> None:
-    items, classes, rooms, dwelling_sizes = read_mapping_list_xlsx_pandas(xlsx_path)
-    """ Ingests the validated data """
-    
-    # Opens the DB, starts a transaction
-    con = sqlite3.connect(str(db_path))
+    """ Ingests the validated data (opens and closes its own connection) """
+
+    # Opens the DB (WAL, synchronous=NORMAL, larger cache)
+    # (isolation_level=None: the explicit BEGIN in the load is the only transaction)
+    con = db_connect(Path(db_path), isolation_level=None, cached_statements=256)
+    try:
+        ingest_mapping_list_pandas_conn(con, xlsx_path=xlsx_path, mode=mode, backend=backend)
+    finally:
+        con.close()
+
+
+def ingest_mapping_list_pandas_conn(
+    con: sqlite3.Connection,
+    *,
+    xlsx_path: str | Path,
+    mode: str = "replace_all",  # "replace_all" or "upsert"
+    backend: str = "calamine",  # Excel reader: "calamine" (openpyxl fallback) or "openpyxl"
+) -> None:
+    """
+    Ingests the validated data on an already-open connection.
+    The connection is left open (e.g. for bootstrap() to keep one session).
+    """
+    items, classes, rooms, dwelling_sizes = read_mapping_list_xlsx_pandas(xlsx_path, backend=backend)
+
+    # Starts a transaction
+    # FK enforcement is switched off for the load (it cannot be changed inside a
+    # transaction) and replaced by a single foreign_key_check before commit
     try:
         cur = con.cursor()
-        cur.execute("PRAGMA foreign_keys = ON;")
+        cur.execute("PRAGMA foreign_keys = OFF;")
         cur.execute("BEGIN;")
 
+        # Drops the item index for large full reloads (rebuilt after the inserts)
+        rebuild_index = mode == "replace_all" and len(items) >= _INDEX_REBUILD_MIN_ITEMS
+        if rebuild_index:
+            cur.execute("DROP INDEX IF EXISTS idx_item_dict_furniture_class;")
+
         # Wipes the current vocab tables before inserting
         if mode == "replace_all":
             cur.execute("DELETE FROM item_dictionary;")
@@ -563,91 +879,54 @@ def ingest_mapping_list_pandas(
             raise ValueError("mode must be 'replace_all' or 'upsert'")
 
         # "upsert" mode: update or insert into existing data (no wipe)
-        # (replace if PK already exists, or insert of missing)
-        
+        # (update in place if PK already exists, or insert if missing)
+        upsert = mode == "upsert"
+
         # Perform on furniture first...
         # (as item_dictionary has a furniture_class column)
-        for c in classes:
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO furniture
-                (furniture_class, furniture_description, class_contains, kgC_kg,
-                ratio_fossil, ratio_biog, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?);
-                """,
-                (
-                    c.furniture_class,
-                    c.furniture_description,
-                    c.class_contains,
-                    c.kgC_kg,
-                    c.ratio_fossil,
-                    c.ratio_biog,
-                    c.notes
-                ),
-            )
+        # Each table is loaded with one executemany (single prepared statement)
+        # and all tables share the one transaction opened above.
+        cur.executemany(
+            _SQL_UPSERT_CLASS if upsert else _SQL_INSERT_CLASS,
+            _row_params(classes),
+        )
 
-                # Then items...
-        for it in items:
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO item_dictionary
-                (item_name, item_description, item_mass, ons_price, price_search_term,
-                 defra_spend_factor_CO2, furniture_class, notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-                """,
-                (
-                    it.item_name,
-                    it.item_description,
-                    it.item_mass,
-                    it.ons_price,
-                    it.price_search_term,
-                    it.defra_spend_factor_CO2,
-                    it.furniture_class,
-                    it.notes,
-                ),
-            )
+        # Then items...
+        cur.executemany(
+            _SQL_UPSERT_ITEM if upsert else _SQL_INSERT_ITEM,
+            _row_params(items),
+        )
 
         # And finally rooms...
         # (Rooms are independent so can be last)
-        for r in rooms:
-            cur.execute(
-                """
-                INSERT OR REPLACE INTO room
-                (room_type, room_description, room_size_m2, size_assumed,
-                room_type_comp_1, room_type_comp_2, room_type_comp_ratio,
-                assumption_notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?);
-                """,
-                (
-                    r.room_type,
-                    r.room_description,
-                    r.room_size_m2,
-                    r.size_assumed,
-                    r.room_type_comp_1,
-                    r.room_type_comp_2,
-                    r.room_type_comp_ratio,
-                    r.assumption_notes,
-                ),
-            )
+        cur.executemany(
+            _SQL_UPSERT_ROOM if upsert else _SQL_INSERT_ROOM,
+            _row_params(rooms),
+        )
 
         # Finally, finally dwelling sizes...
         # (Also independent)
-        for d in dwelling_sizes:
+        cur.executemany(
+            _SQL_UPSERT_DWELLING if upsert else _SQL_INSERT_DWELLING,
+            _row_params(dwelling_sizes),
+        )
+
+        # Rebuilds the dropped index in one pass over the loaded items
+        if rebuild_index:
             cur.execute(
-                """
-                INSERT OR REPLACE INTO dwelling_size
-                (dwelling_type, dwelling_size_m2, count_value, dwelling_type_pmf, dwelling_notes)
-                VALUES (?, ?, ?, ?, ?);
-                """,
-                (
-                    d.dwelling_type,
-                    d.dwelling_size_m2,
-                    d.count_value,
-                    d.dwelling_type_pmf,
-                    d.dwelling_notes,
-                ),
+                "CREATE INDEX idx_item_dict_furniture_class ON item_dictionary (furniture_class);"
+            )
+
+        # Verifies the FKs this load can affect (rolled back below if any fail)
+        violations = _vocab_fk_violations(cur)
+        if violations:
+            details = [f"{table} rowid={rowid} -> {parent}" for table, rowid, parent, _ in violations[:20]]
+            raise sqlite3.IntegrityError(
+                f"mapping_list load leaves {len(violations)} foreign key violation(s): "
+                + "; ".join(details)
             )
 
+        # One commit (single fsync) for the whole load
         con.commit()
         print(
             "mapping_list ingest complete:",
@@ -660,4 +939,4 @@ def ingest_mapping_list_pandas(
         con.rollback()
         raise
     finally:
-        con.close()
+        con.execute("PRAGMA foreign_keys = ON;")
@@ -1,10 +1,18 @@
 from __future__ import annotations
 
+import copy
 from dataclasses import dataclass
+from functools import lru_cache
 from pathlib import Path
 
 import yaml
 
+# Prefer the libyaml C loader where PyYAML was built with it
+try:
+    from yaml import CSafeLoader as _YamlLoader
+except ImportError:
+    from yaml import SafeLoader as _YamlLoader
+
 
 @dataclass(frozen=True)
 class ResolvedPaths:
@@ -23,26 +31,41 @@ class ResolvedDbPath:
     db_handle: str
 
 
+@lru_cache(maxsize=8)
+def _parse_config(config_path: Path, mtime_ns: int, size: int) -> dict:
+    """
+    Parse a YAML config file.
+
+    Cached on (path, mtime, size) so repeat loads within a process skip the
+    parse, while any edit to the file is still picked up.
+    """
+    return yaml.load(config_path.read_text(encoding="utf-8"), Loader=_YamlLoader)
+
+
 def load_local_paths_config(config_path: Path) -> dict:
     """
     Load YAML config/local_paths.yaml.
 
     Checks that the config file exists, then parses it into a Python dictionary.
+    Returns a fresh copy of the (cached) parse so callers can modify it safely.
     """
-    if not config_path.exists():
+    config_path = Path(config_path)
+    try:
+        st = config_path.stat()
+    except FileNotFoundError:
         raise FileNotFoundError(
             f"Config not found: {config_path}\n\n"
             f"Create it by copying:\n"
             f"  config/local_paths.example.yaml -> config/local_paths.yaml\n"
             f"and editing your profile's sharepoint_root."
-        )
+        ) from None
 
-    data = yaml.safe_load(config_path.read_text(encoding="utf-8"))
+    data = _parse_config(config_path.resolve(), st.st_mtime_ns, st.st_size)
 
     if not isinstance(data, dict):
         raise ValueError(f"Config file is not a mapping/dict: {config_path}")
 
-    return data
+    return copy.deepcopy(data)
 
 
 def resolve_paths(